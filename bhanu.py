@@ -5,13 +5,17 @@
 import os
 import sys
 import time
-import json
 import math
+import re
 import random
+import functools
 import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import threading
+from collections import deque
 from datetime import datetime
-from zoneinfo import ZoneInfo  # Python 3.9+
-import requests
+
+from bhanu_json import at_pointer, loads as _loads, dumpb as _dumpb
 
 BANNER = r"""
 ██████  ██   ██  █████  ███    ██ ██    ██ 
@@ -33,18 +37,93 @@ Tools you can use:
   • news                   -> latest headlines
   • ip                     -> your public IP
   • todo [add/list/clear]  -> manage simple todo
+  • multi <cmd>; <cmd>     -> run several tools at once
   • help                   -> show this help
   • exit / quit            -> leave the chat
 """
 
+# One shared session so repeated tool calls reuse keep-alive connections
+# instead of paying a fresh TCP+TLS handshake every time. It is built on
+# first use, so sessions that never touch the network skip importing
+# requests at startup.
+#
+# If httpx and h2 are installed, an HTTP/2 client is used instead: calls
+# to the same host (e.g. several dict lookups in one "multi") share one
+# multiplexed connection. Otherwise it is a pooled requests.Session.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Ollama runs locally: if it isn't listening, fail at once rather than
+# spend a retry backoff on every chat turn.
+OLLAMA_URL = "http://localhost:11434"
+
+def _new_session():
+    try:
+        import h2  # noqa: F401  (httpx needs it for http2=True)
+        import httpx
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        return httpx.Client(
+            timeout=8.0,
+            follow_redirects=True,  # requests follows redirects by default
+            transport=httpx.HTTPTransport(http2=True, retries=2, limits=limits),
+            mounts={OLLAMA_URL: httpx.HTTPTransport(limits=limits)},
+        )
+    except ImportError:
+        pass
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                          max_retries=Retry(total=2, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.mount(OLLAMA_URL, HTTPAdapter(max_retries=0))
+    return session
+
+def _session():
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _new_session()
+    return _SESSION
+
+def _stream_post(url: str, **kwargs):
+    # Streaming POST as a context manager; httpx and requests spell it
+    # differently (requests.Session.stream is a bool default, not a method).
+    session = _session()
+    if callable(getattr(session, "stream", None)):
+        return session.stream("POST", url, **kwargs)
+    return session.post(url, stream=True, **kwargs)
+
+# Small TTL caches for tool responses: key -> (fetched_at, value).
+# ttl=None keeps an entry for the whole session.
+_CACHE_MAX = 256
+_WX_CACHE: dict[str, tuple[float, str]] = {}
+_DICT_CACHE: dict[str, tuple[float, str]] = {}
+_IP_CACHE: dict[str, tuple[float, str]] = {}
+
+def _cache_get(cache: dict, key: str, ttl: float | None) -> str | None:
+    hit = cache.get(key)
+    if hit and (ttl is None or time.monotonic() - hit[0] < ttl):
+        return hit[1]
+    return None
+
+def _cache_put(cache: dict, key: str, value: str) -> None:
+    if key not in cache and len(cache) >= _CACHE_MAX:
+        cache.pop(next(iter(cache)), None)
+    cache[key] = (time.monotonic(), value)
+
 # ----------------------------
 # Tool: Calculator
 # ----------------------------
+_CALC_NS = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
+_CALC_NS["__builtins__"] = {}
+
 def tool_calc(expr: str) -> str:
-    allowed_names = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
-    allowed_names.update({"__builtins__": {}})
     try:
-        result = eval(expr, allowed_names, {})
+        result = eval(expr, _CALC_NS, {})
         return f"{result}"
     except Exception as e:
         return f"Calc error: {e}"
@@ -56,11 +135,16 @@ def tool_weather(city: str) -> str:
     city = city.strip()
     if not city:
         return "Please provide a city, e.g., 'weather Hyderabad'."
+    cached = _cache_get(_WX_CACHE, city, ttl=120)
+    if cached is not None:
+        return cached
     try:
         url = f"https://wttr.in/{city}?format=3"
-        r = requests.get(url, timeout=6)
-        if r.status_code == 200 and r.text.strip():
-            return r.text.strip()
+        r = _session().get(url, timeout=6)
+        text = r.text.strip()
+        if r.status_code == 200 and text:
+            _cache_put(_WX_CACHE, city, text)
+            return text
         return f"Couldn't fetch weather for '{city}'."
     except Exception:
         return f"The weather in {city} is sunny (dummy)."
@@ -68,11 +152,17 @@ def tool_weather(city: str) -> str:
 # ----------------------------
 # Tool: Time (local or TZ)
 # ----------------------------
+@functools.lru_cache(maxsize=64)
+def _zi(name: str):
+    from zoneinfo import ZoneInfo  # Python 3.9+; only loaded for 'time <zone>'
+    return ZoneInfo(name)
+
 def tool_time(tz: str | None) -> str:
     try:
         if tz:
-            now = datetime.now(ZoneInfo(tz.strip()))
-            return now.strftime(f"%Y-%m-%d %H:%M:%S %Z (tz='{tz.strip()}')")
+            tz = tz.strip()
+            now = datetime.now(_zi(tz))
+            return now.strftime("%Y-%m-%d %H:%M:%S %Z") + f" (tz='{tz}')"
         else:
             now = datetime.now()
             return now.strftime("%Y-%m-%d %H:%M:%S (local)")
@@ -82,24 +172,26 @@ def tool_time(tz: str | None) -> str:
 # ----------------------------
 # Tool: Joke
 # ----------------------------
+_JOKES = (
+    "Why do programmers prefer dark mode? Because light attracts bugs!",
+    "A SQL query walks into a bar, walks up to two tables and asks: 'Can I join you?'",
+    "Debugging: being the detective in a crime movie where you are also the murderer.",
+)
+
 def tool_joke() -> str:
-    jokes = [
-        "Why do programmers prefer dark mode? Because light attracts bugs!",
-        "A SQL query walks into a bar, walks up to two tables and asks: 'Can I join you?'",
-        "Debugging: being the detective in a crime movie where you are also the murderer.",
-    ]
-    return random.choice(jokes)
+    return _JOKES[random.randrange(len(_JOKES))]
 
 # ----------------------------
 # Tool: Quote
 # ----------------------------
+_QUOTES = (
+    "Believe you can and you're halfway there.",
+    "Success is not final, failure is not fatal: it is the courage to continue that counts.",
+    "Do what you can, with what you have, where you are.",
+)
+
 def tool_quote() -> str:
-    quotes = [
-        "Believe you can and you're halfway there.",
-        "Success is not final, failure is not fatal: it is the courage to continue that counts.",
-        "Do what you can, with what you have, where you are.",
-    ]
-    return random.choice(quotes)
+    return _QUOTES[random.randrange(len(_QUOTES))]
 
 # ----------------------------
 # Tool: Dictionary (Free API)
@@ -107,11 +199,14 @@ def tool_quote() -> str:
 def tool_dict(word: str) -> str:
     if not word:
         return "Usage: dict <word>"
+    meaning = _cache_get(_DICT_CACHE, word.lower(), ttl=None)
+    if meaning is not None:
+        return f"{word}: {meaning}"
     try:
-        r = requests.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}", timeout=6)
+        r = _session().get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}", timeout=6)
         if r.status_code == 200:
-            j = r.json()
-            meaning = j[0]["meanings"][0]["definitions"][0]["definition"]
+            meaning = at_pointer(r.content, "/0/meanings/0/definitions/0/definition")
+            _cache_put(_DICT_CACHE, word.lower(), meaning)
             return f"{word}: {meaning}"
         return f"No definition found for {word}."
     except Exception:
@@ -126,9 +221,9 @@ def tool_translate(lang: str, text: str) -> str:
     try:
         url = "https://libretranslate.de/translate"
         payload = {"q": text, "source": "en", "target": lang, "format": "text"}
-        r = requests.post(url, data=payload, timeout=8)
+        r = _session().post(url, data=payload, timeout=8)
         if r.status_code == 200:
-            return r.json().get("translatedText", "Translation failed")
+            return _loads(r.content).get("translatedText", "Translation failed")
         return "Translation error."
     except Exception:
         return f"Translation (offline dummy): {text} in {lang}"
@@ -138,9 +233,9 @@ def tool_translate(lang: str, text: str) -> str:
 # ----------------------------
 def tool_news() -> str:
     try:
-        r = requests.get("https://newsapi.org/v2/top-headlines?country=us&apiKey=demo", timeout=8)
+        r = _session().get("https://newsapi.org/v2/top-headlines?country=us&apiKey=demo", timeout=8)
         if r.status_code == 200:
-            j = r.json()
+            j = _loads(r.content)
             headlines = [a["title"] for a in j.get("articles", [])[:5]]
             return " | ".join(headlines) if headlines else "No news found."
     except Exception:
@@ -151,10 +246,15 @@ def tool_news() -> str:
 # Tool: IP
 # ----------------------------
 def tool_ip() -> str:
+    ip = _cache_get(_IP_CACHE, "ip", ttl=None)
+    if ip is not None:
+        return "Your IP: " + ip
     try:
-        r = requests.get("https://api.ipify.org?format=json", timeout=5)
+        r = _session().get("https://api.ipify.org?format=json", timeout=5)
         if r.status_code == 200:
-            return "Your IP: " + r.json()["ip"]
+            ip = _loads(r.content)["ip"]
+            _cache_put(_IP_CACHE, "ip", ip)
+            return "Your IP: " + ip
     except Exception:
         return "Your IP: 127.0.0.1 (dummy offline)"
     return "Could not fetch IP."
@@ -167,40 +267,48 @@ TODO_FILE = "bhanu_todo.json"
 def load_todos():
     if os.path.exists(TODO_FILE):
         try:
-            return json.load(open(TODO_FILE))
+            with open(TODO_FILE, "rb") as f:
+                return _loads(f.read())
         except:
             return []
     return []
 
 def save_todos(todos):
-    with open(TODO_FILE, "w") as f:
-        json.dump(todos, f)
-
-def tool_todo(cmd: str) -> str:
-    todos = load_todos()
-    parts = cmd.split(maxsplit=2)
-    if len(parts) == 1 or parts[1] == "list":
-        return "Your TODOs:\n" + "\n".join([f"- {t}" for t in todos]) if todos else "No tasks yet."
-    elif parts[1] == "add" and len(parts) > 2:
-        todos.append(parts[2])
-        save_todos(todos)
-        return f"Added: {parts[2]}"
-    elif parts[1] == "clear":
-        save_todos([])
+    # One encoded write instead of text-mode encoding through the buffer.
+    with open(TODO_FILE, "wb") as f:
+        f.write(_dumpb(todos))
+
+# Loaded once; the file is only rewritten when the list changes.
+_TODOS = load_todos()
+
+def tool_todo(args: str) -> str:
+    parts = args.split(maxsplit=1)
+    if not parts or parts[0] == "list":
+        if not _TODOS:
+            return "No tasks yet."
+        return "Your TODOs:\n" + "\n".join("- " + t for t in _TODOS)
+    elif parts[0] == "add" and len(parts) > 1:
+        _TODOS.append(parts[1])
+        save_todos(_TODOS)
+        return f"Added: {parts[1]}"
+    elif parts[0] == "clear":
+        _TODOS.clear()
+        save_todos(_TODOS)
         return "Todo list cleared."
     else:
         return "Usage: todo add <task> | todo list | todo clear"
 
 # ----------------------------
-# Chat backends (unchanged from your code)
+# Chat backends
 # ----------------------------
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+
 def chat_openai(messages: list[dict]) -> str | None:
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not OPENAI_API_KEY:
         return None
     try:
         from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = OpenAI(api_key=OPENAI_API_KEY, timeout=30)
         resp = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
@@ -210,7 +318,10 @@ def chat_openai(messages: list[dict]) -> str | None:
     except Exception:
         return None
 
-def chat_ollama(messages: list[dict]) -> str | None:
+def chat_ollama(messages: list[dict], on_token=None) -> str | None:
+    # Streams the reply; on_token(text) is called for each piece as it
+    # arrives so the caller can print it before generation finishes.
+    parts = []
     try:
         def to_prompt(msgs):
             lines = []
@@ -225,27 +336,130 @@ def chat_ollama(messages: list[dict]) -> str | None:
             return "\n".join(lines)
 
         prompt = to_prompt(messages)
-        data = {"model": "llama3.1", "prompt": prompt, "stream": False}
-        r = requests.post("http://localhost:11434/api/generate", json=data, timeout=30)
-        if r.status_code == 200:
-            j = r.json()
-            return j.get("response", "").strip()
-        return None
+        data = {"model": "llama3.1", "prompt": prompt, "stream": True}
+        with _stream_post(f"{OLLAMA_URL}/api/generate", json=data, timeout=30) as r:
+            if r.status_code != 200:
+                return None
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                chunk = _loads(line)
+                token = chunk.get("response", "")
+                if not parts:
+                    token = token.lstrip()
+                if token:
+                    parts.append(token)
+                    if on_token:
+                        on_token(token)
+                if chunk.get("done"):
+                    break
     except Exception:
-        return None
+        pass
+    # Keep whatever already streamed out if the connection drops midway.
+    return "".join(parts).strip() or None
+
+class _LostRace(Exception):
+    pass
+
+def _spawn(fn, *args) -> Future:
+    # Run fn on a daemon thread so a call abandoned by Ctrl-C can't hold
+    # up interpreter exit the way a pool worker would.
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def chat_race(messages: list[dict], on_token=None) -> str | None:
+    # Ask OpenAI and Ollama at the same time instead of one after the
+    # other. Whichever answers first wins: a complete OpenAI reply, or the
+    # first streamed Ollama token. A losing Ollama stream is aborted; a
+    # losing OpenAI call finishes in the background and is ignored.
+    # Ctrl-C stops the Ollama stream at its next token.
+    if not OPENAI_API_KEY:
+        return chat_ollama(messages, on_token=on_token)
+
+    lock = threading.Lock()
+    winner = []
+
+    def claim(name, force=False):
+        with lock:
+            if force:
+                winner[:] = [name]
+            elif not winner:
+                winner.append(name)
+            return winner[0] == name
+
+    def ollama_token(token):
+        if not claim("ollama"):
+            raise _LostRace()
+        if on_token:
+            on_token(token)
+
+    f_openai = _spawn(chat_openai, messages)
+    f_ollama = _spawn(chat_ollama, messages, ollama_token)
+    try:
+        done, _ = wait((f_openai, f_ollama), return_when=FIRST_COMPLETED)
+        if f_openai in done:
+            reply = f_openai.result()
+            if reply is not None and claim("openai"):
+                return reply
+            return f_ollama.result()
+        reply = f_ollama.result()
+        return reply if reply is not None else f_openai.result()
+    except BaseException:
+        claim("cancelled", force=True)
+        raise
+
+# All fallback keywords in one pattern, so the input is scanned once;
+# the named group that matched picks the canned reply.
+_KW_RE = re.compile(
+    r"(?P<greet>\b(?:hello|hi|hey|namaste)\b)"
+    r"|(?P<bsearch>binary search)"
+    r"|(?P<linux>linux tip)"
+    r"|(?P<sports>sports.*study|study.*sports)",
+    re.I,
+)
+_KW_REPLIES = {
+    "greet": "Hi! I’m Bhanu — your terminal agent. Ask me to calc, check weather, or just chat!",
+    "bsearch": "Binary search halves the search range in a sorted array; O(log n) time.",
+    "linux": "Linux tip: use `ctrl+r` in the terminal to reverse-search your command history.",
+    "sports": "Balance idea: 50-minute study sprints + 10-minute stretch or light drills.",
+}
 
 def chat_fallback(user_text: str) -> str:
-    text = user_text.lower().strip()
-    if any(k in text for k in ["hello", "hi", "hey", "namaste"]):
-        return "Hi! I’m Bhanu — your terminal agent. Ask me to calc, check weather, or just chat!"
-    if "binary search" in text:
-        return "Binary search halves the search range in a sorted array; O(log n) time."
-    if "linux tip" in text:
-        return "Linux tip: use `ctrl+r` in the terminal to reverse-search your command history."
-    if "sports" in text and "study" in text:
-        return "Balance idea: 50-minute study sprints + 10-minute stretch or light drills."
+    m = _KW_RE.search(user_text)
+    if m:
+        return _KW_REPLIES[m.lastgroup]
     return "I’m offline 😅 — try a tool (calc/weather/time/joke/news/etc)."
 
+# ----------------------------
+# Conversation history
+# ----------------------------
+# Only the last HISTORY_MESSAGES messages are sent verbatim. Older ones are
+# folded into short one-line notes on the system prompt (also bounded), so
+# each request stays the same size however long the session runs.
+SYSTEM_PROMPT = "You are Bhanu, a helpful, concise terminal AI agent."
+HISTORY_MESSAGES = 32
+NOTE_CHARS = 160
+
+def remember(history: deque, notes: deque, message: dict) -> None:
+    if len(history) == history.maxlen:
+        old = history.popleft()
+        notes.append(f"{old['role']}: {old['content'][:NOTE_CHARS]}")
+    history.append(message)
+
+def build_messages(history: deque, notes: deque) -> list[dict]:
+    system = SYSTEM_PROMPT
+    if notes:
+        system += "\nEarlier in this conversation:\n" + "\n".join(notes)
+    return [{"role": "system", "content": system}, *history]
+
 # ----------------------------
 # Agent loop
 # ----------------------------
@@ -254,62 +468,67 @@ def print_banner():
     print("Bhanu Terminal Agent — Tools + Chat\n")
     print(HELP_TEXT)
 
+def _translate(rest: str) -> str:
+    parts = rest.split(maxsplit=1)
+    if len(parts) == 2:
+        return f"[translate] {tool_translate(parts[0], parts[1])}"
+    return "Usage: translate <lang> <text>"
+
+# Tools are mostly network-bound, so "multi" runs them side by side
+# and the turn takes as long as the slowest one instead of the sum.
+_POOL = ThreadPoolExecutor(max_workers=8)
+
+def _multi(rest: str) -> str:
+    cmds = [c.strip() for c in rest.split(";") if c.strip()]
+    # A nested "multi" would block a worker waiting on subtasks queued
+    # behind it, so it is never sent to the pool.
+    futures = [None if c.split(maxsplit=1)[0].lower() == "multi" else _POOL.submit(handle_tool, c)
+               for c in cmds]
+    replies = []
+    for cmd, f in zip(cmds, futures):
+        reply = f.result() if f else None
+        if reply is None or reply == "__EXIT__":
+            reply = f"Not a tool command: {cmd}"
+        replies.append(reply)
+    return "\n".join(replies)
+
+# First word of the input -> handler taking the rest of the line.
+# A handler returns None when the input isn't really a tool call
+# (e.g. "calc" with no expression, or "news today"), so it falls
+# through to chat.
+TOOLS = {
+    "calc": lambda rest: f"[calc] {tool_calc(rest)}" if rest else None,
+    "weather": lambda rest: f"[weather] {tool_weather(rest)}" if rest else None,
+    "time": lambda rest: f"[time] {tool_time(rest or None)}",
+    "joke": lambda rest: None if rest else f"[joke] {tool_joke()}",
+    "quote": lambda rest: None if rest else f"[quote] {tool_quote()}",
+    "dict": lambda rest: f"[dict] {tool_dict(rest)}" if rest else None,
+    "translate": lambda rest: _translate(rest) if rest else None,
+    "news": lambda rest: None if rest else f"[news] {tool_news()}",
+    "ip": lambda rest: None if rest else f"[ip] {tool_ip()}",
+    "todo": lambda rest: f"[todo] {tool_todo(rest)}",
+    "multi": lambda rest: _multi(rest) if rest else None,
+}
+
 def handle_tool(user_input: str) -> str | None:
     s = user_input.strip()
-    if s.lower() in ("help", "/help", "?"):
+    sl = s.lower()
+    if sl in ("help", "/help", "?"):
         return HELP_TEXT
-    if s.lower() in ("exit", "quit"):
+    if sl in ("exit", "quit"):
         return "__EXIT__"
 
-    # calc
-    if s.lower().startswith("calc "):
-        return f"[calc] {tool_calc(s[5:].strip())}"
-
-    # weather
-    if s.lower().startswith("weather "):
-        return f"[weather] {tool_weather(s[8:].strip())}"
-
-    # time
-    if s.lower().startswith("time"):
-        rest = s[4:].strip()
-        return f"[time] {tool_time(rest if rest else None)}"
-
-    # joke
-    if s.lower() == "joke":
-        return f"[joke] {tool_joke()}"
-
-    # quote
-    if s.lower() == "quote":
-        return f"[quote] {tool_quote()}"
-
-    # dict
-    if s.lower().startswith("dict "):
-        return f"[dict] {tool_dict(s[5:].strip())}"
-
-    # translate
-    if s.lower().startswith("translate "):
-        parts = s.split(maxsplit=2)
-        if len(parts) >= 3:
-            return f"[translate] {tool_translate(parts[1], parts[2])}"
-        return "Usage: translate <lang> <text>"
-
-    # news
-    if s.lower() == "news":
-        return f"[news] {tool_news()}"
-
-    # ip
-    if s.lower() == "ip":
-        return f"[ip] {tool_ip()}"
-
-    # todo
-    if s.lower().startswith("todo"):
-        return f"[todo] {tool_todo(s)}"
-
-    return None
+    # Only the command word is lowercased; arguments keep their case.
+    parts = s.split(maxsplit=1)
+    if not parts:
+        return None
+    tool = TOOLS.get(parts[0].lower())
+    return tool(parts[1] if len(parts) > 1 else "") if tool else None
 
 def main():
     print_banner()
-    messages = [{"role": "system", "content": "You are Bhanu, a helpful, concise terminal AI agent."}]
+    history = deque(maxlen=HISTORY_MESSAGES)
+    notes = deque(maxlen=HISTORY_MESSAGES)
 
     while True:
         try:
@@ -329,10 +548,22 @@ def main():
             print(f"Agent: {tool_reply}")
             continue
 
-        messages.append({"role": "user", "content": user})
-        reply = chat_openai(messages) or chat_ollama(messages) or chat_fallback(user)
-        messages.append({"role": "assistant", "content": reply})
-        print(f"Agent: {reply}")
+        streamed = []
+
+        def echo(token):
+            if not streamed:
+                sys.stdout.write("Agent: ")
+            streamed.append(token)
+            sys.stdout.write(token)
+            sys.stdout.flush()
+
+        remember(history, notes, {"role": "user", "content": user})
+        reply = chat_race(build_messages(history, notes), on_token=echo) or chat_fallback(user)
+        remember(history, notes, {"role": "assistant", "content": reply})
+        if streamed:
+            print()
+        else:
+            print(f"Agent: {reply}")
 
 if __name__ == "__main__":
     try:
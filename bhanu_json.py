@@ -0,0 +1,50 @@
+# bhanu_json.py — JSON helpers for bhanu.py
+# Uses the fastest parser that is installed: orjson > ujson > stdlib json.
+# loads() accepts str or bytes; dumps() returns str, dumpb() UTF-8 bytes.
+# at_pointer() pulls one value out of a JSON document by JSON Pointer.
+
+import threading
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    dumpb = orjson.dumps
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+    loads = _json.loads
+    dumps = _json.dumps
+
+    def dumpb(obj) -> bytes:
+        return _json.dumps(obj).encode()
+
+
+# With pysimdjson, at_pointer() parses into simdjson's C-level document and
+# only turns the requested value into a Python object, instead of building
+# dicts/lists for the whole payload. Parsers are not thread-safe ("multi"
+# runs tools on worker threads), so each thread gets its own.
+try:
+    import simdjson
+
+    _local = threading.local()
+
+    def at_pointer(data, pointer: str):
+        parser = getattr(_local, "parser", None)
+        if parser is None:
+            parser = _local.parser = simdjson.Parser()
+        return parser.parse(data).at_pointer(pointer)
+except ImportError:
+    def at_pointer(data, pointer: str):
+        value = loads(data)
+        for part in pointer.split("/")[1:]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        return value